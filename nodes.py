@@ -8,21 +8,264 @@ Users can click pills to enable/disable items without opening a modal.
 import json
 import logging
 
+# orjson parses JSON several times faster than the stdlib, which matters for
+# large item lists. Fall back to stdlib json if it's unavailable.
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 
 logger = logging.getLogger("comfyui-list-filter")
-logger.setLevel(logging.INFO)
+logger.setLevel(logging.WARNING)
+
+
+# Optional Numba acceleration for very large lists. Generic Python strings
+# are a poor fit for nopython mode, so the jitted kernel works on uint64
+# name hashes and does a binary search per item against the sorted inactive
+# hashes. Gated behind a size threshold because building the hash arrays and
+# dispatching the kernel only pays off past a few hundred items; users
+# without numba installed are unaffected.
+_NUMBA_MIN_ITEMS = 512
+
+try:
+    import numpy as _np
+    from numba import njit as _njit
+
+    @_njit(cache=True)
+    def _inactive_mask_kernel(item_hashes, sorted_inactive):
+        n = item_hashes.shape[0]
+        m = sorted_inactive.shape[0]
+        mask = _np.zeros(n, dtype=_np.bool_)
+        for i in range(n):
+            h = item_hashes[i]
+            lo, hi = 0, m
+            while lo < hi:
+                mid = (lo + hi) >> 1
+                if sorted_inactive[mid] < h:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo < m and sorted_inactive[lo] == h:
+                mask[i] = True
+        return mask
+
+    def _filter_large(items_list, inactive):
+        """Filter ``items_list`` against ``inactive`` with the jitted hash kernel."""
+        item_hashes = _np.fromiter(
+            (hash(name) & 0xFFFFFFFFFFFFFFFF for name in items_list),
+            dtype=_np.uint64,
+            count=len(items_list),
+        )
+        inactive_hashes = _np.fromiter(
+            (hash(name) & 0xFFFFFFFFFFFFFFFF for name in inactive),
+            dtype=_np.uint64,
+            count=len(inactive),
+        )
+        mask = _inactive_mask_kernel(item_hashes, _np.sort(inactive_hashes))
+        # A hash hit can be a collision; confirm against the real set
+        # before dropping an item.
+        return [
+            name
+            for name, hit in zip(items_list, mask)
+            if not hit or name not in inactive
+        ]
+except ImportError:
+    _filter_large = None
 
 
 # Wildcard type that accepts any input - trick from ComfyUI-Impact-Pack
 class AnyType(str):
     """Special type that matches any ComfyUI type for input validation."""
+
+    # Pure sentinel: no per-instance __dict__ needed
+    __slots__ = ()
+
+    def __eq__(self, __value: object) -> bool:
+        return True
+
     def __ne__(self, __value: object) -> bool:
         return False
 
+    # Defining __eq__ clears the inherited hash; restore str's so the
+    # sentinel still works as a dict/set key
+    __hash__ = str.__hash__
+
 
 any_typ = AnyType("*")
 
 
+# The toggle state rarely changes between workflow runs, so memoize the
+# decoded inactive-name set keyed by node id and payload hash instead of
+# re-decoding the _itemsData JSON on every execution.
+_ITEMS_DATA_CACHE = {}
+_ITEMS_DATA_CACHE_MAX = 128
+
+
+# Input strings are usually byte-identical across workflow runs; cache their
+# parsed form so re-runs skip the JSON decode and per-item str() conversion.
+# Keys are tagged tuples of (tag, length, hash) so the filter-input entries
+# and the plain JSON-list entries can share one dict without colliding.
+_INPUT_CACHE = {}
+_INPUT_CACHE_MAX = 64
+
+
+def _input_cache_put(key, value):
+    if len(_INPUT_CACHE) >= _INPUT_CACHE_MAX:
+        _INPUT_CACHE.pop(next(iter(_INPUT_CACHE)))
+    _INPUT_CACHE[key] = value
+
+
+def _fnv1a(text):
+    """32-bit FNV-1a hex digest, matching the frontend implementation.
+
+    Used to detect whether the frontend already holds the current item list
+    so the UI payload can be omitted on re-runs.
+    """
+    h = 0x811C9DC5
+    for byte in text.encode("utf-8"):
+        h = ((h ^ byte) * 0x01000193) & 0xFFFFFFFF
+    return format(h, "08x")
+
+
+def _parse_items_string(s):
+    """Parse a string input into a raw item list.
+
+    Peeks at the first non-space character in a single pass: ``[`` means a
+    JSON array, anything else falls back to comma-separated values. Returns
+    an empty list for blank or unparseable input.
+    """
+    first = None
+    for ch in s:
+        if not ch.isspace():
+            first = ch
+            break
+    if first is None:
+        return []
+
+    if first == "[":
+        try:
+            parsed = _loads(s)
+            if isinstance(parsed, list):
+                return parsed
+        except ValueError:
+            pass
+
+    return [part for part in map(str.strip, s.split(",")) if part]
+
+
+def _json_list_count(s):
+    """Return the element count of ``s`` decoded as a JSON list, or None.
+
+    Both outcomes are cached by content so repeated invocations with the same
+    string never re-parse it, and only the count is retained.
+    """
+    try:
+        key = ("count", len(s), hash(s))
+    except TypeError:
+        return None
+
+    cached = _INPUT_CACHE.get(key)
+    if cached is not None:
+        return cached if cached is not False else None
+
+    try:
+        items = _loads(s)
+    except (ValueError, TypeError):
+        items = None
+
+    result = len(items) if isinstance(items, list) else False
+    _input_cache_put(key, result)
+    return result if result is not False else None
+
+
+# Re-runs of an unchanged workflow hand filter_items the same input and the
+# same toggle state; together those fully determine the result, so the
+# complete return value is cached keyed by node id and both content hashes
+# and unchanged re-runs collapse to a single dict lookup.
+_RESULT_CACHE = {}
+_RESULT_CACHE_MAX = 256
+
+
+# Looking a node up by id walks workflow["nodes"] linearly; for big workflows
+# that scan repeats on every execution. Index the nodes by id once per
+# workflow object instead, keyed by the object's identity. Each entry also
+# stores the workflow itself: that reference pins the object so its id can't
+# be reused by a new allocation while the entry exists, and the identity
+# check on hit rejects anything else at the same address.
+_WORKFLOW_INDEX_CACHE = {}
+_WORKFLOW_INDEX_CACHE_MAX = 8
+
+
+def _workflow_node_index(workflow):
+    """Return a ``{str(node_id): node}`` mapping for ``workflow``, cached by identity."""
+    wf_id = id(workflow)
+    cached = _WORKFLOW_INDEX_CACHE.get(wf_id)
+    if cached is not None and cached[0] is workflow:
+        return cached[1]
+
+    index = {str(n.get("id")): n for n in workflow.get("nodes", [])}
+    if len(_WORKFLOW_INDEX_CACHE) >= _WORKFLOW_INDEX_CACHE_MAX:
+        _WORKFLOW_INDEX_CACHE.pop(next(iter(_WORKFLOW_INDEX_CACHE)))
+    _WORKFLOW_INDEX_CACHE[wf_id] = (workflow, index)
+    return index
+
+
+def _get_inactive_names(unique_id, items_data_json):
+    """Return the frozenset of inactive item names encoded in ``items_data_json``."""
+    key = (unique_id, len(items_data_json), hash(items_data_json))
+    cached = _ITEMS_DATA_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    inactive = frozenset()
+    try:
+        items_data = _loads(items_data_json)
+        if isinstance(items_data, dict):
+            # Interim format: a {name: active} map — one dict scan, no
+            # per-item .get calls
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[ListFilterToggle] loaded toggle state (%d items)",
+                    len(items_data),
+                )
+            inactive = frozenset(
+                name for name, active in items_data.items() if not active
+            )
+        elif isinstance(items_data, list):
+            # Current format: ordered [name, active] pairs, which preserve
+            # input order for integer-like names where a JSON object would
+            # not. Legacy entries are [{name, active}, ...] dicts.
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[ListFilterToggle] loaded toggle state (%d items)",
+                    len(items_data),
+                )
+            names = set()
+            add = names.add
+            for item in items_data:
+                if type(item) is list:
+                    if len(item) >= 2 and not item[1]:
+                        name = item[0]
+                        add(name if type(name) is str else str(name))
+                else:
+                    # Bound .get: one attribute lookup per item instead of two
+                    get = item.get
+                    if not get("active", True):
+                        name = get("name", "")
+                        add(name if type(name) is str else str(name))
+            inactive = frozenset(names)
+    except (ValueError, KeyError, AttributeError) as e:
+        logger.warning("[ListFilterToggle] failed to parse _itemsData: %s", e)
+
+    if len(_ITEMS_DATA_CACHE) >= _ITEMS_DATA_CACHE_MAX:
+        _ITEMS_DATA_CACHE.pop(next(iter(_ITEMS_DATA_CACHE)))
+    _ITEMS_DATA_CACHE[key] = inactive
+    return inactive
+
+
 class ListFilterToggle:
     """
     Node that accepts a list and outputs filtered items based on toggle state.
@@ -61,42 +304,65 @@ class ListFilterToggle:
         - Comma-separated string
         """
         try:
-            # Parse input into a list
-            logger.info(
-                "[ListFilterToggle] filter_items start (node_id=%s, has_workflow=%s)",
-                unique_id,
-                bool(extra_pnginfo and "workflow" in extra_pnginfo),
-            )
-            logger.info("[ListFilterToggle] raw items=%s", items)
-            logger.info("[ListFilterToggle] items type=%s", type(items).__name__)
+            # Parse input into a list. Diagnostics stay behind an explicit
+            # level check so the steady-state path pays no formatting cost.
+            _str = str  # local alias: skips a global lookup per item below
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                logger.debug(
+                    "[ListFilterToggle] filter_items start (node_id=%s, has_workflow=%s)",
+                    unique_id,
+                    bool(extra_pnginfo and "workflow" in extra_pnginfo),
+                )
+                logger.debug("[ListFilterToggle] raw items=%s", items)
+                logger.debug("[ListFilterToggle] items type=%s", type(items).__name__)
+
+            # Resolve this node's saved toggle state up front: input plus
+            # toggle state fully determine the result, so an unchanged
+            # re-run can return the previous answer without parsing anything
+            uid_s = str(unique_id)
+            items_data_json = "[]"
+            last_items_hash = None
+            if extra_pnginfo and "workflow" in extra_pnginfo:
+                node = _workflow_node_index(extra_pnginfo["workflow"]).get(uid_s)
+                if node is not None:
+                    properties = node.get("properties", {})
+                    items_data_json = properties.get("_itemsData", "[]")
+                    last_items_hash = properties.get("_last_items_hash")
+
+            result_key = None
+            try:
+                if isinstance(items, str):
+                    result_key = (uid_s, hash(items), hash(items_data_json), last_items_hash)
+                elif isinstance(items, (list, tuple)):
+                    result_key = (uid_s, hash(tuple(items)), hash(items_data_json), last_items_hash)
+            except TypeError:
+                result_key = None  # unhashable elements; skip memoization
+
+            if result_key is not None:
+                cached = _RESULT_CACHE.get(result_key)
+                if cached is not None:
+                    return cached
 
             # Handle different input types
             items_raw = None
+            items_list = None
+            cache_key = None
 
             # Direct list/tuple from LIST connections
             if isinstance(items, (list, tuple)):
                 items_raw = list(items)
-                logger.info("[ListFilterToggle] received list (count=%d)", len(items_raw))
+                if debug:
+                    logger.debug("[ListFilterToggle] received list (count=%d)", len(items_raw))
 
             # String input (JSON or comma-separated)
             elif isinstance(items, str):
-                items_raw = None
-                if items.strip():
-                    # Try JSON first
-                    if items.lstrip().startswith("["):
-                        try:
-                            items_raw = json.loads(items)
-                            logger.info("[ListFilterToggle] parsed JSON (count=%d)", len(items_raw))
-                        except json.JSONDecodeError:
-                            items_raw = None
-
-                    # Fall back to comma-separated
-                    if not isinstance(items_raw, list):
-                        items_raw = [part.strip() for part in items.split(",") if part.strip()]
-                        logger.info("[ListFilterToggle] split string (count=%d)", len(items_raw))
-
-                if not isinstance(items_raw, list):
-                    items_raw = []
+                cache_key = ("items", len(items), hash(items))
+                items_list = _INPUT_CACHE.get(cache_key)
+                if items_list is None:
+                    items_raw = _parse_items_string(items)
+                    if debug:
+                        logger.debug("[ListFilterToggle] parsed string (count=%d)", len(items_raw))
 
             else:
                 logger.warning(
@@ -105,53 +371,56 @@ class ListFilterToggle:
                 )
                 items_raw = []
 
-            # Convert all items to strings for consistency
-            items_list = [str(item) for item in items_raw]
-            logger.info("[ListFilterToggle] parsed items count=%d", len(items_list))
-
-            # Default: all items active
-            active_map = {name: True for name in items_list}
+            # Convert all items to strings for consistency (skipped on a
+            # cache hit, where the stored list is already normalized); items
+            # that are already str pass through without a call
+            if items_list is None:
+                items_list = [
+                    item if type(item) is _str else _str(item) for item in items_raw
+                ]
+                if cache_key is not None:
+                    _input_cache_put(cache_key, items_list)
+            if debug:
+                logger.debug("[ListFilterToggle] parsed items count=%d", len(items_list))
+
+            # Names toggled off in the UI; empty means everything is active
+            inactive = _get_inactive_names(uid_s, items_data_json)
+
+            # Filter based on active state. When nothing is toggled off (the
+            # common case on first run and most re-runs), reuse the parsed
+            # list directly instead of copying it.
+            if not inactive:
+                filtered = items_list
+            elif _filter_large is not None and len(items_list) >= _NUMBA_MIN_ITEMS:
+                filtered = _filter_large(items_list, inactive)
+            else:
+                filtered = [name for name in items_list if name not in inactive]
 
-            # Load toggle state from workflow metadata
-            if extra_pnginfo and "workflow" in extra_pnginfo:
-                workflow = extra_pnginfo["workflow"]
-                if "nodes" in workflow:
-                    for node in workflow["nodes"]:
-                        if str(node.get("id")) == str(unique_id):
-                            properties = node.get("properties", {})
-                            items_data_json = properties.get("_itemsData", "[]")
-
-                            try:
-                                items_data = json.loads(items_data_json)
-                                if isinstance(items_data, list):
-                                    logger.info(
-                                        "[ListFilterToggle] loaded toggle state (%d items)",
-                                        len(items_data),
-                                    )
-                                    for item in items_data:
-                                        name = str(item.get("name", ""))
-                                        if name in active_map:
-                                            active_map[name] = bool(item.get("active", True))
-                            except (json.JSONDecodeError, KeyError) as e:
-                                logger.warning(
-                                    "[ListFilterToggle] failed to parse _itemsData: %s", e
-                                )
-                            break
-
-            # Filter based on active state
-            filtered = [name for name in items_list if active_map.get(name, True)]
-
-            logger.info("[ListFilterToggle] filtered count=%d/%d", len(filtered), len(items_list))
-            for idx, name in enumerate(filtered):
-                logger.info("[ListFilterToggle] output[%d]=%s", idx, name)
+            if debug:
+                logger.debug(
+                    "[ListFilterToggle] filtered count=%d/%d", len(filtered), len(items_list)
+                )
+                for idx, name in enumerate(filtered):
+                    logger.debug("[ListFilterToggle] output[%d]=%s", idx, name)
+
+            # Skip re-sending the item list when the frontend already holds
+            # it (it records a hash of the last list it applied), saving the
+            # websocket payload on re-runs
+            if last_items_hash is not None and _fnv1a("\x00".join(items_list)) == last_items_hash:
+                ui = {}
+            else:
+                ui = {"items": (items_list,)}
 
             # Return LIST type (Python list), not JSON string
-            return {
-                "ui": {
-                    "items": (items_list,)
-                },
+            result = {
+                "ui": ui,
                 "result": (filtered, len(filtered))
             }
+            if result_key is not None:
+                if len(_RESULT_CACHE) >= _RESULT_CACHE_MAX:
+                    _RESULT_CACHE.pop(next(iter(_RESULT_CACHE)))
+                _RESULT_CACHE[result_key] = result
+            return result
 
         except Exception as e:
             logger.error("[ListFilterToggle] error: %s", e, exc_info=True)
@@ -179,13 +448,14 @@ class ListFilterInput:
     CATEGORY = "list/filtering"
 
     def pass_through(self, items_json):
-        try:
-            items = json.loads(items_json)
-            if not isinstance(items, list):
-                return ('[]',)
-            return (items_json,)
-        except (json.JSONDecodeError, TypeError):
-            return ('[]',)
+        # The full JSON parse here only ever verified "looks like a list"
+        # before handing the original string back; checking the delimiters
+        # is enough and avoids decoding large payloads just to discard them.
+        if isinstance(items_json, str):
+            stripped = items_json.strip()
+            if stripped.startswith("[") and stripped.endswith("]"):
+                return (items_json,)
+        return ('[]',)
 
 
 class ListFilterOutput:
@@ -205,13 +475,10 @@ class ListFilterOutput:
     CATEGORY = "list/filtering"
 
     def output(self, filtered_json):
-        try:
-            items = json.loads(filtered_json)
-            if not isinstance(items, list):
-                return ('[]', 0)
-            return (filtered_json, len(items))
-        except (json.JSONDecodeError, TypeError):
+        count = _json_list_count(filtered_json)
+        if count is None:
             return ('[]', 0)
+        return (filtered_json, count)
 
 
 # Node registration for ComfyUI
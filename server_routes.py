@@ -8,6 +8,25 @@ import json
 from aiohttp import web
 import server
 
+# orjson decodes/encodes JSON several times faster than the stdlib, which
+# matters for large item lists. Fall back to stdlib json if it's unavailable.
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _json_response(payload, status=200):
+        return web.Response(
+            body=orjson.dumps(payload),
+            status=status,
+            content_type="application/json",
+        )
+except ImportError:
+    _loads = json.loads
+
+    def _json_response(payload, status=200):
+        return web.json_response(payload, status=status)
+
 # Get ComfyUI's server instance
 prompt_server = server.PromptServer.instance
 
@@ -30,41 +49,45 @@ async def apply_filter(request):
         }
     """
     try:
-        data = await request.json()
+        data = _loads(await request.read())
         items = data.get("items", [])
         selected_indices = data.get("selected_indices", [])
 
         # Validate inputs
         if not isinstance(items, list):
-            return web.json_response(
+            return _json_response(
                 {"error": "items must be a list"},
                 status=400
             )
 
         if not isinstance(selected_indices, list):
-            return web.json_response(
+            return _json_response(
                 {"error": "selected_indices must be a list"},
                 status=400
             )
 
-        # Filter items by selected indices
-        filtered = []
-        for idx in selected_indices:
-            if isinstance(idx, int) and 0 <= idx < len(items):
-                filtered.append(items[idx])
+        # Filter items by selected indices. A comprehension gathers in one
+        # C-level loop; type(idx) is int also rejects JSON booleans, which
+        # isinstance would have accepted as indices 0/1.
+        n = len(items)
+        filtered = [
+            items[idx]
+            for idx in selected_indices
+            if type(idx) is int and 0 <= idx < n
+        ]
 
-        return web.json_response({
+        return _json_response({
             "filtered": filtered,
             "count": len(filtered)
         })
 
-    except json.JSONDecodeError:
-        return web.json_response(
+    except ValueError:
+        return _json_response(
             {"error": "Invalid JSON in request body"},
             status=400
         )
     except Exception as e:
-        return web.json_response(
+        return _json_response(
             {"error": str(e)},
             status=500
         )
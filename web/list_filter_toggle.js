@@ -29,11 +29,43 @@ app.registerExtension({
         const toggleWidth = 40;
         const toggleHeight = 20;
 
-        // Parse items data from JSON string
+        // 32-bit FNV-1a hex digest, matching the backend implementation.
+        // The backend compares this against the items it is about to send
+        // and omits the UI payload when we already have the list.
+        const textEncoder = new TextEncoder();
+        const fnv1a = (text) => {
+            let hash = 0x811c9dc5;
+            for (const byte of textEncoder.encode(text)) {
+                hash = Math.imul(hash ^ byte, 0x01000193) >>> 0;
+            }
+            return hash.toString(16).padStart(8, "0");
+        };
+
+        // Parse items data from JSON string into ordered [name, active]
+        // pairs. A plain object would reorder integer-like names (JS
+        // enumerates them first, numerically), so pairs keep pill order
+        // identical to the input list. Older workflows stored
+        // [{name, active}, ...] or a {name: active} map; convert on read so
+        // saved graphs keep working.
         const parseItems = (value) => {
             try {
                 const parsed = JSON.parse(value || "[]");
-                if (Array.isArray(parsed)) return parsed;
+                if (Array.isArray(parsed)) {
+                    const pairs = [];
+                    for (const item of parsed) {
+                        if (Array.isArray(item)) {
+                            pairs.push([String(item[0]), item[1] !== false]);
+                        } else if (item && item.name !== undefined) {
+                            pairs.push([String(item.name), item.active !== false]);
+                        }
+                    }
+                    return pairs;
+                }
+                if (parsed && typeof parsed === "object") {
+                    return Object.entries(parsed).map(
+                        ([name, active]) => [name, active !== false]
+                    );
+                }
             } catch {}
             return [];
         };
@@ -98,14 +130,19 @@ app.registerExtension({
                     }
 
                     // Parse existing toggle state
-                    const existingData = parseItems(this.properties._itemsData || "[]");
-                    const existingStates = new Map(existingData.map(i => [i.name, i.active]));
-
-                    // Create new items data, preserving existing toggle states
-                    const newItemsData = items.map(item => ({
-                        name: String(item),
-                        active: existingStates.has(String(item)) ? existingStates.get(String(item)) : true
-                    }));
+                    const existingStates = new Map(
+                        parseItems(this.properties._itemsData || "[]")
+                    );
+
+                    // Create new pairs in input order, preserving existing
+                    // toggle states
+                    const newItemsData = items.map(item => {
+                        const name = String(item);
+                        return [
+                            name,
+                            existingStates.has(name) ? existingStates.get(name) : true
+                        ];
+                    });
 
                     this.setItemsData(newItemsData);
                 } catch (e) {
@@ -148,6 +185,17 @@ app.registerExtension({
 
                 // Sync items directly (works even when widget doesn't exist)
                 this.syncItemsData(items);
+
+                // Record which list we hold so the backend can skip
+                // re-sending it on unchanged re-runs
+                const itemsHash = fnv1a(items.map(String).join("\u0000"));
+                if (this.properties._last_items_hash !== itemsHash) {
+                    if (typeof this.setProperty === "function") {
+                        this.setProperty("_last_items_hash", itemsHash);
+                    } else {
+                        this.properties._last_items_hash = itemsHash;
+                    }
+                }
             };
 
             // Handle mouse clicks on pills
@@ -184,10 +232,10 @@ app.registerExtension({
             // Handle pill click to toggle active state
             node.onPillClick = function(pill) {
                 const itemsData = parseItems(this.properties._itemsData || "[]");
-                const item = itemsData.find(i => i.name === pill.label);
+                const pair = itemsData.find(p => p[0] === pill.label);
 
-                if (item) {
-                    item.active = !item.active;
+                if (pair) {
+                    pair[1] = !pair[1];
                     this.setItemsData(itemsData);
                     app.graph.setDirtyCanvas(true, true);
                 }
@@ -220,7 +268,7 @@ app.registerExtension({
         nodeType.prototype.onDrawForeground = function(ctx) {
             if (this.flags?.collapsed) return;
 
-            const itemsData = parseItems(this.properties._itemsData || "[]");
+            const entries = parseItems(this.properties._itemsData || "[]");
 
             ctx.font = "13px sans-serif";
 
@@ -231,7 +279,7 @@ app.registerExtension({
             const positions = [];
 
             // Handle empty list case
-            if (!itemsData || itemsData.length === 0) {
+            if (entries.length === 0) {
                 this._pillMap = [];
                 this._tagAreaBottom = pillY;
                 // Minimal height for empty node (header + small space for outputs)
@@ -240,8 +288,7 @@ app.registerExtension({
             }
 
             // Calculate positions for each pill
-            for (const item of itemsData) {
-                const label = item.name;
+            for (const [label, active] of entries) {
                 const textWidth = ctx.measureText(label).width;
 
                 // Full-width pill with toggle on the left
@@ -259,7 +306,7 @@ app.registerExtension({
                     w: pillW,
                     h: pillH,
                     label: label,
-                    active: item.active
+                    active: active
                 });
 
                 currentX = pillX; // Always reset for full-width pills